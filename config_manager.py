@@ -2,14 +2,142 @@
 Configuration Manager - Handles loading and validation of configuration files.
 """
 
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional: C implementation of indented JSON output
+    orjson = None
+
+
+# Built once at import time; lists are stored as tuples so the shared copy stays immutable
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "capture_contents": True,
+    "parallel_read": True,
+    "fast_match": False,
+    "max_content_size": 10485760,
+    "timestamp_format": "iso",
+    "include_size": True,
+    "include_modified": True,
+    "capture_extensions": (),
+    "no_capture_extensions": (
+        ".exe",
+        ".dll",
+        ".so",
+        ".dylib",
+        ".bin",
+        ".img",
+        ".iso",
+        ".zip",
+        ".rar",
+        ".7z",
+        ".tar",
+        ".gz",
+        ".bz2",
+        ".xz",
+        ".pdf",
+        ".doc",
+        ".docx",
+        ".xls",
+        ".xlsx",
+        ".ppt",
+        ".pptx",
+        ".mp3",
+        ".mp4",
+        ".avi",
+        ".mkv",
+        ".wav",
+        ".flac",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".tiff",
+        ".webp",
+        ".ico"
+    ),
+    "ignore_extensions": (
+        ".pyc",
+        ".pyo",
+        ".pyd",
+        ".so",
+        ".dll",
+        ".dylib",
+        ".o",
+        ".obj",
+        ".exe",
+        ".bin",
+        ".log",
+        ".tmp",
+        ".temp",
+        ".cache",
+        ".bak",
+        ".swp",
+        ".swo",
+        "~",
+        ".DS_Store",
+        "Thumbs.db"
+    ),
+    "ignore_file_patterns": (
+        "*.tmp",
+        "*.temp",
+        "*.log",
+        "*.cache",
+        "*.bak",
+        ".*",
+        "#*#",
+        "*~"
+    ),
+    "ignore_folder_patterns": (
+        "__pycache__",
+        "*.egg-info",
+        ".git",
+        ".svn",
+        ".hg",
+        ".bzr",
+        "CVS",
+        ".vscode",
+        ".idea",
+        "node_modules",
+        "venv",
+        "env",
+        ".env",
+        "virtualenv",
+        ".venv",
+        "build",
+        "dist",
+        "target",
+        "bin",
+        "obj",
+        ".pytest_cache",
+        ".coverage",
+        ".tox",
+        ".mypy_cache",
+        "outputs"
+    ),
+    "ignore_paths": (
+        ".gitignore",
+        ".gitattributes",
+        "LICENSE",
+        "setup.py",
+        "setup.cfg",
+        "pyproject.toml",
+        "Pipfile",
+        "Pipfile.lock"
+    )
+}
 
 
 class ConfigManager:
     """Manages configuration file loading and validation."""
     
+    # Validated configurations shared by all instances: path -> (mtime_ns, config)
+    _cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+    
     def __init__(self, config_path: str):
         """
         Initialize the ConfigManager.
@@ -18,7 +146,19 @@ class ConfigManager:
             config_path: Path to the configuration file
         """
         self.config_path = Path(config_path)
-        self.default_config = self._get_default_config()
+        self._default_config = None
+    
+    @property
+    def default_config(self) -> Dict[str, Any]:
+        """
+        Default configuration, built on first access.
+        
+        Returns:
+            Default configuration dictionary owned by this instance
+        """
+        if self._default_config is None:
+            self._default_config = self._get_default_config()
+        return self._default_config
     
     def _get_default_config(self) -> Dict[str, Any]:
         """
@@ -28,115 +168,8 @@ class ConfigManager:
             Default configuration dictionary
         """
         return {
-            "capture_contents": True,
-            "max_content_size": 10485760,
-            "capture_extensions": [],
-            "no_capture_extensions": [
-                ".exe",
-                ".dll",
-                ".so",
-                ".dylib",
-                ".bin",
-                ".img",
-                ".iso",
-                ".zip",
-                ".rar",
-                ".7z",
-                ".tar",
-                ".gz",
-                ".bz2",
-                ".xz",
-                ".pdf",
-                ".doc",
-                ".docx",
-                ".xls",
-                ".xlsx",
-                ".ppt",
-                ".pptx",
-                ".mp3",
-                ".mp4",
-                ".avi",
-                ".mkv",
-                ".wav",
-                ".flac",
-                ".jpg",
-                ".jpeg",
-                ".png",
-                ".gif",
-                ".bmp",
-                ".tiff",
-                ".webp",
-                ".ico"
-            ],
-            "ignore_extensions": [
-                ".pyc",
-                ".pyo",
-                ".pyd",
-                ".so",
-                ".dll",
-                ".dylib",
-                ".o",
-                ".obj",
-                ".exe",
-                ".bin",
-                ".log",
-                ".tmp",
-                ".temp",
-                ".cache",
-                ".bak",
-                ".swp",
-                ".swo",
-                "~",
-                ".DS_Store",
-                "Thumbs.db"
-            ],
-            "ignore_file_patterns": [
-                "*.tmp",
-                "*.temp",
-                "*.log",
-                "*.cache",
-                "*.bak",
-                ".*",
-                "#*#",
-                "*~"
-            ],
-            "ignore_folder_patterns": [
-                "__pycache__",
-                "*.egg-info",
-                ".git",
-                ".svn",
-                ".hg",
-                ".bzr",
-                "CVS",
-                ".vscode",
-                ".idea",
-                "node_modules",
-                "venv",
-                "env",
-                ".env",
-                "virtualenv",
-                ".venv",
-                "build",
-                "dist",
-                "target",
-                "bin",
-                "obj",
-                ".pytest_cache",
-                ".coverage",
-                ".tox",
-                ".mypy_cache",
-                "outputs"
-            ],
-            "ignore_paths": [
-                ".gitignore",
-                ".gitattributes",
-                "LICENSE",
-                "setup.py",
-                "setup.cfg",
-                "pyproject.toml",
-                "Pipfile",
-                "Pipfile.lock"
-            ]
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in _DEFAULT_CONFIG.items()
         }
     
     def load_config(self) -> Dict[str, Any]:
@@ -156,11 +189,20 @@ class ConfigManager:
             return self.default_config.copy()
         
         try:
+            # Reuse the parsed config while the file is unchanged
+            cache_key = self.config_path.absolute()
+            mtime_ns = self.config_path.stat().st_mtime_ns
+            cached = ConfigManager._cache.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                return copy.deepcopy(cached[1])
+            
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
             
             # Validate and merge with defaults
-            return self._validate_and_merge_config(config)
+            merged_config = self._validate_and_merge_config(config)
+            ConfigManager._cache[cache_key] = (mtime_ns, merged_config)
+            return copy.deepcopy(merged_config)
         
         except json.JSONDecodeError as e:
             raise json.JSONDecodeError(
@@ -171,6 +213,11 @@ class ConfigManager:
         except Exception as e:
             raise FileNotFoundError(f"Error reading config file '{self.config_path}': {e}")
     
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all previously loaded configurations."""
+        cls._cache.clear()
+    
     def _create_default_config(self) -> None:
         """
         Create a default configuration file.
@@ -179,8 +226,7 @@ class ConfigManager:
             Exception: If unable to create the config file
         """
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.default_config, f, indent=2, ensure_ascii=False)
+            self._write_json(self.default_config)
         except Exception as e:
             raise Exception(f"Failed to create default config file '{self.config_path}': {e}")
     
@@ -198,7 +244,8 @@ class ConfigManager:
         merged_config = self.default_config.copy()
         
         # Validate and merge boolean options
-        for key in ['capture_contents']:
+        for key in ['capture_contents', 'parallel_read', 'fast_match',
+                    'include_size', 'include_modified']:
             if key in config:
                 if isinstance(config[key], bool):
                     merged_config[key] = config[key]
@@ -213,6 +260,14 @@ class ConfigManager:
                 else:
                     print(f"Warning: '{key}' in config should be a positive integer, using default")
         
+        # Validate and merge choice options
+        for key, choices in [('timestamp_format', ('iso', 'epoch'))]:
+            if key in config:
+                if config[key] in choices:
+                    merged_config[key] = config[key]
+                else:
+                    print(f"Warning: '{key}' in config should be one of {', '.join(choices)}, using default")
+        
         # Validate and merge list options
         for key in ['ignore_extensions', 'ignore_file_patterns', 
                    'ignore_folder_patterns', 'ignore_paths',
@@ -237,7 +292,20 @@ class ConfigManager:
             Exception: If unable to save the config file
         """
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            self._write_json(config)
         except Exception as e:
-            raise Exception(f"Failed to save config file '{self.config_path}': {e}")
\ No newline at end of file
+            raise Exception(f"Failed to save config file '{self.config_path}': {e}")
+    
+    def _write_json(self, config: Dict[str, Any]) -> None:
+        """
+        Write a configuration dictionary to the config file as indented JSON.
+        
+        Args:
+            config: Configuration dictionary to write
+        """
+        if orjson is not None:
+            with open(self.config_path, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
\ No newline at end of file
@@ -3,18 +3,139 @@ Directory Packager - Core functionality for scanning directories and generating
 """
 
 import json
+import logging
 import os
 import base64
+import mmap
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, Iterator, List, Any, Mapping, Optional, Set, Tuple, Union
 import fnmatch
-from datetime import datetime
+import functools
+import itertools
 import re
+import sys
+import time
+from collections import deque
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import charset_normalizer
+except ImportError:  # Optional: encoding detection for non-UTF-8 text files
+    charset_normalizer = None
+
+try:
+    import orjson
+except ImportError:  # Optional: C implementation of indented JSON output
+    orjson = None
+
+
+# Verbose output goes through this logger; records are formatted only when it is enabled.
+# Applications attach their own handler (main.py prints to stdout)
+logger = logging.getLogger('directory_packager')
+logger.addHandler(logging.NullHandler())
+
+
+class _VerboseLogger(logging.LoggerAdapter):
+    """Passes records to the module logger only for packagers created with verbose=True."""
+    
+    def isEnabledFor(self, level: int) -> bool:
+        return self.extra['verbose'] and self.logger.isEnabledFor(level)
+
+
+# Extensions whose contents are always stored as base64
+BINARY_EXTENSIONS = frozenset({
+    # Office documents
+    '.xlsx', '.xls', '.docx', '.doc', '.pptx', '.ppt',
+    # Archives
+    '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2',
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.svg',
+    # Audio/Video
+    '.mp3', '.mp4', '.avi', '.mkv', '.wav', '.ogg',
+    # Executables
+    '.exe', '.dll', '.so', '.dylib',
+    # Other binary formats
+    '.pdf', '.bin', '.dat', '.db', '.sqlite'
+})
+
+
+def _fmt_ts(ts: float) -> str:
+    """
+    Format a POSIX timestamp as local time, identical to datetime.isoformat().
+    
+    Args:
+        ts: Seconds since the epoch
+        
+    Returns:
+        ISO 8601 string, with microseconds only when they are non-zero
+    """
+    # Round to the microsecond the same way datetime.fromtimestamp does
+    whole, frac = divmod(ts, 1.0)
+    us = round(frac * 1e6)
+    if us >= 1000000:
+        whole += 1
+        us -= 1000000
+    text = _fmt_seconds(int(whole))
+    return f'{text}.{us:06d}' if us else text
+
+
+def _file_extension(name: str) -> str:
+    """
+    Get the lowercased extension of a file name, following PurePath.suffix rules.
+    
+    Args:
+        name: File name
+        
+    Returns:
+        Extension including the dot, or an empty string; interned because the same
+        few extensions recur throughout a tree
+    """
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return sys.intern(name[i:].lower())
+    return ''
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_seconds(seconds: int) -> str:
+    """
+    Format whole seconds since the epoch as local time.
+    
+    Files in a tree often share a modification second (checkouts, extractions),
+    so results are cached.
+    
+    Args:
+        seconds: Whole seconds since the epoch
+        
+    Returns:
+        ISO 8601 string without fractional seconds
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
 
 
 class DirectoryPackager:
     """Handles directory scanning and JSON generation with configurable ignore patterns."""
     
+    # Names still ignored when .gitignore replaces the configured patterns
+    ESSENTIAL_IGNORES = frozenset(('.git', '__pycache__'))
+    
+    # Maximum number of file reads kept in flight ahead of the consumer
+    READ_AHEAD = 64
+    
+    # Bytes of binary data encoded per step when streaming; a multiple of 3 so the
+    # base64 chunks concatenate without padding
+    BASE64_CHUNK_SIZE = 48 * 1024
+    
+    # Text files at least this large are decoded from a memory map
+    MMAP_THRESHOLD = 256 * 1024
+    
+    # Leading bytes searched for a NUL when deciding whether a file is binary
+    SNIFF_SIZE = 8192
+    
+    # Output buffer for the streamed JSON file; nodes are written in many small pieces
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, config: Dict[str, Any], verbose: bool = False):
         """
         Initialize the DirectoryPackager.
@@ -25,6 +146,7 @@ class DirectoryPackager:
         """
         self.config = config
         self.verbose = verbose
+        self._log = _VerboseLogger(logger, {'verbose': verbose})
         self.stats = {
             'directories': 0,
             'files': 0,
@@ -33,6 +155,68 @@ class DirectoryPackager:
         self.gitignore_patterns = []
         self.use_gitignore = False
         self.source_root = None
+        self._root_str = ''
+        self._gitignore_file_re = self._gitignore_dir_re = self._compile_patterns([])
+        
+        # Precompile ignore patterns once instead of calling fnmatch per pattern per path
+        file_patterns = config.get('ignore_file_patterns', [])
+        # Directories are matched against file and folder patterns at once
+        dir_patterns = file_patterns + config.get('ignore_folder_patterns', [])
+        if config.get('fast_match', False):
+            # Plain '*<suffix>' patterns become str.endswith checks; only real globs use the regex
+            self._file_suffixes, file_patterns = self._split_suffix_patterns(file_patterns)
+            self._dir_suffixes, dir_patterns = self._split_suffix_patterns(dir_patterns)
+        else:
+            self._file_suffixes = self._dir_suffixes = ()
+        self._file_re = self._compile_patterns(file_patterns)
+        self._dir_name_re = self._compile_patterns(dir_patterns)
+        self._ignore_ext_tuple = tuple(e.lower() for e in config.get('ignore_extensions', []))
+        self._ignore_paths = frozenset(config.get('ignore_paths', []))
+        self._ignore_paths_tuple = tuple(self._ignore_paths)
+        self._capture_contents = config.get('capture_contents', True)
+        self._max_content_size = config.get('max_content_size', 10 * 1024 * 1024)  # 10MB default
+        self._capture_ext = frozenset(e.lower() for e in config.get('capture_extensions', []))
+        self._no_capture_ext = frozenset(e.lower() for e in config.get('no_capture_extensions', []))
+        self._epoch_timestamps = config.get('timestamp_format', 'iso') == 'epoch'
+        self._include_size = config.get('include_size', True)
+        self._include_modified = config.get('include_modified', True)
+        self._needs_stat = self._capture_contents or self._include_size or self._include_modified
+    
+    def _compile_patterns(self, patterns: List[str]) -> 're.Pattern':
+        """
+        Combine fnmatch-style patterns into a single compiled regular expression.
+        
+        Args:
+            patterns: List of wildcard patterns
+            
+        Returns:
+            Compiled pattern matching any of the given patterns (never matches if empty)
+        """
+        if not patterns:
+            return re.compile(r'(?!)')
+        # Normalize case the same way fnmatch.fnmatch does for the current platform
+        return re.compile('|'.join(
+            f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in patterns
+        ))
+    
+    def _split_suffix_patterns(self, patterns: List[str]) -> Tuple[Tuple[str, ...], List[str]]:
+        """
+        Separate patterns of the form '*<literal>' from general wildcard patterns.
+        
+        Args:
+            patterns: List of wildcard patterns
+            
+        Returns:
+            Tuple of (normalized literal suffixes, remaining patterns)
+        """
+        suffixes = []
+        globs = []
+        for pattern in patterns:
+            if pattern.startswith('*') and not any(c in pattern[1:] for c in '*?['):
+                suffixes.append(os.path.normcase(pattern[1:]))
+            else:
+                globs.append(pattern)
+        return tuple(suffixes), globs
     
     def load_gitignore(self, source_directory: Path) -> bool:
         """
@@ -45,9 +229,11 @@ class DirectoryPackager:
             True if .gitignore was found and loaded, False otherwise
         """
         self.source_root = source_directory
+        self._root_str = os.path.join(str(source_directory), '')
         gitignore_path = source_directory / '.gitignore'
         
-        if gitignore_path.exists() and gitignore_path.is_file():
+        # is_file() is False for missing paths, so one stat covers both checks
+        if gitignore_path.is_file():
             try:
                 with open(gitignore_path, 'r', encoding='utf-8') as f:
                     lines = f.readlines()
@@ -59,28 +245,35 @@ class DirectoryPackager:
                     if line and not line.startswith('#'):
                         self.gitignore_patterns.append(line)
                 
+                # Negation patterns are not supported; patterns ending in '/' only match directories
+                file_patterns = [p for p in self.gitignore_patterns
+                                 if not p.startswith('!') and not p.endswith('/')]
+                dir_only_patterns = [p[:-1] for p in self.gitignore_patterns
+                                     if not p.startswith('!') and p.endswith('/')]
+                self._gitignore_file_re = self._compile_patterns(file_patterns)
+                self._gitignore_dir_re = self._compile_patterns(file_patterns + dir_only_patterns)
+                
                 self.use_gitignore = True
-                if self.verbose:
-                    print(f"Loaded .gitignore with {len(self.gitignore_patterns)} patterns from: {gitignore_path}")
+                self._log.debug('Loaded .gitignore with %d patterns from: %s', len(self.gitignore_patterns), gitignore_path)
                 return True
                 
             except Exception as e:
-                if self.verbose:
-                    print(f"Warning: Could not read .gitignore file {gitignore_path}: {e}")
+                self._log.warning('Warning: Could not read .gitignore file %s: %s', gitignore_path, e)
                 self.use_gitignore = False
                 return False
         else:
             self.use_gitignore = False
-            if self.verbose:
-                print(f"No .gitignore found in source directory, using config.json patterns")
+            self._log.debug('No .gitignore found in source directory, using config.json patterns')
             return False
     
-    def matches_gitignore_pattern(self, path: Path) -> bool:
+    def matches_gitignore_pattern(self, full_path: str, name: str, is_dir: bool) -> bool:
         """
         Check if a path matches any .gitignore pattern.
         
         Args:
-            path: Path to check (relative to source root)
+            full_path: Path to check (located under the source root)
+            name: Final component of the path
+            is_dir: Whether the path is a directory
             
         Returns:
             True if the path should be ignored according to .gitignore
@@ -88,135 +281,127 @@ class DirectoryPackager:
         if not self.use_gitignore or not self.source_root:
             return False
         
-        try:
-            # Get relative path from source root
-            rel_path = path.relative_to(self.source_root)
-            path_str = str(rel_path).replace('\\', '/')
-            name = path.name
-            
-            for pattern in self.gitignore_patterns:
-                # Handle negation patterns (starting with !)
-                if pattern.startswith('!'):
-                    continue  # Skip negation patterns for now (complex logic)
-                
-                # Handle directory patterns (ending with /)
-                if pattern.endswith('/'):
-                    if path.is_dir():
-                        dir_pattern = pattern[:-1]
-                        if fnmatch.fnmatch(name, dir_pattern) or fnmatch.fnmatch(path_str, dir_pattern):
-                            return True
-                else:
-                    # Handle file and directory patterns
-                    if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path_str, pattern):
-                        return True
-                    
-                    # Handle patterns with path separators
-                    if '/' in pattern:
-                        if fnmatch.fnmatch(path_str, pattern):
-                            return True
+        # Paths come from walking source_root, so the relative path is a plain slice
+        if not full_path.startswith(self._root_str):
+            return False
+        path_str = full_path[len(self._root_str):].replace('\\', '/')
         
-        except ValueError:
-            # Path is not relative to source_root
-            pass
+        # Each pattern is tried against both the name and the relative path
+        pattern_re = self._gitignore_dir_re if is_dir else self._gitignore_file_re
+        if pattern_re.match(os.path.normcase(name)) or pattern_re.match(os.path.normcase(path_str)):
+            return True
         
         return False
     
-    def should_ignore(self, path: Path) -> bool:
+    def should_ignore(self, name: str, is_dir: bool, full_path: str) -> bool:
         """
         Check if a path should be ignored based on .gitignore patterns or configuration patterns.
         
+        Checks only look at strings; callers pass is_dir from the os.scandir entry so
+        no stat calls are needed. The cheapest checks run first.
+        
         Args:
-            path: Path to check
+            name: Final component of the path
+            is_dir: Whether the path is a directory
+            full_path: Full path as a string
             
         Returns:
             True if the path should be ignored, False otherwise
         """
         # First check .gitignore patterns if available
-        if self.use_gitignore and self.matches_gitignore_pattern(path):
-            if self.verbose:
-                print(f"Ignoring (gitignore pattern): {path}")
+        if self.use_gitignore and self.matches_gitignore_pattern(full_path, name, is_dir):
+            self._log.debug('Ignoring (gitignore pattern): %s', full_path)
             return True
         
         # If using .gitignore, don't apply config patterns (except for essential ones)
         if self.use_gitignore:
             # Only apply essential ignores when using .gitignore
-            name = path.name
-            essential_patterns = ['.git', '__pycache__']
-            if name in essential_patterns or (path.is_dir() and name in essential_patterns):
-                if self.verbose:
-                    print(f"Ignoring (essential pattern): {path}")
+            if name in self.ESSENTIAL_IGNORES:
+                self._log.debug('Ignoring (essential pattern): %s', full_path)
                 return True
             return False
         
-        # Fall back to config.json patterns when no .gitignore
-        name = path.name
+        # Fall back to config.json patterns when no .gitignore, cheapest checks first
+        # Check ignored paths (exact matches)
+        if name in self._ignore_paths:
+            self._log.debug('Ignoring path: %s', full_path)
+            return True
         
         # Check ignored file extensions
-        if path.is_file():
-            for ext in self.config.get('ignore_extensions', []):
-                if name.lower().endswith(ext.lower()):
-                    if self.verbose:
-                        print(f"Ignoring file (extension): {path}")
-                    return True
-        
-        # Check ignored file patterns
-        for pattern in self.config.get('ignore_file_patterns', []):
-            if fnmatch.fnmatch(name, pattern):
-                if self.verbose:
-                    print(f"Ignoring (file pattern): {path}")
-                return True
+        if not is_dir and self._ignore_ext_tuple and name.lower().endswith(self._ignore_ext_tuple):
+            self._log.debug('Ignoring file (extension): %s', full_path)
+            return True
         
-        # Check ignored folder patterns
-        if path.is_dir():
-            for pattern in self.config.get('ignore_folder_patterns', []):
-                if fnmatch.fnmatch(name, pattern):
-                    if self.verbose:
-                        print(f"Ignoring folder: {path}")
-                    return True
+        # Check ignored paths (suffix matches)
+        if self._ignore_paths_tuple and full_path.endswith(self._ignore_paths_tuple):
+            self._log.debug('Ignoring path: %s', full_path)
+            return True
         
-        # Check ignored paths (exact matches)
-        for ignored_path in self.config.get('ignore_paths', []):
-            if str(path).endswith(ignored_path) or name == ignored_path:
-                if self.verbose:
-                    print(f"Ignoring path: {path}")
-                return True
+        # Check ignored file and folder name patterns with a single regex match
+        if is_dir:
+            name_re, suffixes = self._dir_name_re, self._dir_suffixes
+        else:
+            name_re, suffixes = self._file_re, self._file_suffixes
+        name_key = os.path.normcase(name)
+        if (suffixes and name_key.endswith(suffixes)) or name_re.match(name_key):
+            self._log.debug('Ignoring (%s pattern): %s', 'folder' if is_dir else 'file', full_path)
+            return True
         
         return False
     
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
+    def get_file_info(self, entry: os.DirEntry) -> Dict[str, Any]:
         """
         Get information about a file including its contents.
         
         Args:
-            file_path: Path to the file
+            entry: Directory entry for the file
             
         Returns:
             Dictionary containing file information and contents
         """
+        file_info, file_path = self._get_file_metadata(entry)
+        if file_path is not None:
+            file_info['contents'] = self._get_file_contents(file_path, size=file_info.get('size'))
+        return file_info
+    
+    def _get_file_metadata(self, entry: os.DirEntry) -> Tuple[Dict[str, Any], Optional[Path]]:
+        """
+        Get information about a file without reading its contents.
+        
+        Args:
+            entry: Directory entry for the file
+            
+        Returns:
+            Tuple of (file information, path whose contents should be captured or None)
+        """
         try:
-            stat = file_path.stat()
             file_info = {
-                'name': file_path.name,
-                'type': 'file',
-                'size': stat.st_size,
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                'extension': file_path.suffix.lower() if file_path.suffix else None
+                'name': entry.name,
+                'type': 'file'
             }
+            # Structure-only scans that need neither size nor time skip the stat call
+            stat = None
+            if self._needs_stat:
+                stat = entry.stat()
+                if self._include_size:
+                    file_info['size'] = stat.st_size
+                if self._include_modified:
+                    file_info['modified'] = stat.st_mtime if self._epoch_timestamps else _fmt_ts(stat.st_mtime)
+            extension = _file_extension(entry.name)
+            file_info['extension'] = extension or None
             
             # Check if we should capture contents based on config
-            if self._should_capture_contents(file_path):
-                file_info['contents'] = self._get_file_contents(file_path)
-            
-            return file_info
+            if self._should_capture_contents(entry.path, stat, extension):
+                return file_info, Path(entry.path)
+            return file_info, None
             
         except (OSError, IOError) as e:
-            if self.verbose:
-                print(f"Warning: Could not get info for file {file_path}: {e}")
+            self._log.warning('Warning: Could not get info for file %s: %s', entry.path, e)
             return {
-                'name': file_path.name,
+                'name': entry.name,
                 'type': 'file',
                 'error': str(e)
-            }
+            }, None
     
     def scan_directory(self, root_path: Path) -> Dict[str, Any]:
         """
@@ -228,8 +413,119 @@ class DirectoryPackager:
         Returns:
             Dictionary representing the directory structure
         """
-        if self.verbose:
-            print(f"Scanning: {root_path}")
+        result = self._start_scan(root_path)
+        
+        # Directory nodes come with an empty 'contents' list; link children into it
+        open_dirs = []
+        for kind, node in self._iter_with_contents(self._iter_tree(root_path, result)):
+            if kind == 'enter':
+                if open_dirs:
+                    open_dirs[-1]['contents'].append(node)
+                open_dirs.append(node)
+            elif kind == 'file':
+                open_dirs[-1]['contents'].append(node)
+            else:
+                open_dirs.pop()
+        
+        return result
+    
+    def stream_scan_to_json(self, root_path: Path, output_path: Path) -> None:
+        """
+        Scan a directory and write its JSON representation straight to a file.
+        
+        Produces the same document as save_to_json(scan_directory(root_path)), but
+        each node is written as soon as it is scanned and file contents are dropped
+        once written, so memory use does not grow with the size of the tree.
+        
+        Args:
+            root_path: Root directory to scan
+            output_path: Path to save the JSON file
+        """
+        result = self._start_scan(root_path)
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        
+        try:
+            with open(output_path, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as f:
+                # Number of children written so far for each open directory
+                child_counts = []
+                events = self._iter_tree(root_path, result, exclude_path=output_path)
+                for kind, node in self._iter_with_contents(events, encode_binary=False):
+                    if kind == 'exit':
+                        indent = '    ' * (len(child_counts) - 1)
+                        if child_counts.pop():
+                            f.write(f"\n{indent}  ]")
+                        else:
+                            f.write("]")
+                        if 'error' in node:
+                            f.write(f",\n{indent}  \"error\": {encoder.encode(node['error'])}")
+                        f.write(f"\n{indent}}}")
+                        continue
+                    
+                    indent = '    ' * len(child_counts)
+                    if child_counts:
+                        if child_counts[-1]:
+                            f.write(",")
+                        f.write(f"\n{indent}")
+                        child_counts[-1] += 1
+                    
+                    if kind == 'file':
+                        self._write_file_node(f, node, indent, encoder)
+                    else:
+                        f.write("{")
+                        for key, value in node.items():
+                            if key not in ('contents', 'error'):
+                                f.write(f"\n{indent}  {encoder.encode(key)}: {encoder.encode(value)},")
+                        f.write(f"\n{indent}  \"contents\": [")
+                        child_counts.append(0)
+        except Exception as e:
+            raise Exception(f"Failed to save JSON file: {e}")
+    
+    def _write_file_node(self, f, file_info: Dict[str, Any], indent: str,
+                         encoder: json.JSONEncoder) -> None:
+        """
+        Write one file entry of the streamed JSON document.
+        
+        Raw binary data is base64-encoded chunk by chunk straight into the output,
+        so the full encoded string is never held in memory.
+        
+        Args:
+            f: Output file handle
+            file_info: File information, possibly holding raw bytes as content data
+            indent: Indentation of the entry's opening brace
+            encoder: Encoder configured like save_to_json
+        """
+        contents = file_info.get('contents')
+        if not isinstance(contents, dict) or not isinstance(contents.get('data'), bytes):
+            # Structural newlines are the only raw newlines the encoder emits
+            for chunk in encoder.iterencode(file_info):
+                f.write(chunk.replace('\n', '\n' + indent))
+            return
+        
+        f.write("{")
+        for key, value in file_info.items():
+            if key != 'contents':
+                f.write(f"\n{indent}  {encoder.encode(key)}: {encoder.encode(value)},")
+        f.write(f"\n{indent}  \"contents\": {{")
+        for key, value in contents.items():
+            if key != 'data':
+                f.write(f"\n{indent}    {encoder.encode(key)}: {encoder.encode(value)},")
+        f.write(f"\n{indent}    \"data\": \"")
+        data = memoryview(contents['data'])
+        for start in range(0, len(data), self.BASE64_CHUNK_SIZE):
+            f.write(base64.b64encode(data[start:start + self.BASE64_CHUNK_SIZE]).decode('ascii'))
+        f.write(f"\"\n{indent}  }}\n{indent}}}")
+    
+    def _start_scan(self, root_path: Path) -> Dict[str, Any]:
+        """
+        Prepare for a new scan and build the root directory node.
+        
+        Args:
+            root_path: Root directory to scan
+            
+        Returns:
+            Root directory node with an empty contents list
+        """
+        self._log.debug('Scanning: %s', root_path)
         
         # Load .gitignore from source directory first
         self.load_gitignore(root_path)
@@ -237,95 +533,154 @@ class DirectoryPackager:
         # Reset stats
         self.stats = {'directories': 0, 'files': 0, 'ignored': 0}
         
-        result = {
+        return {
             'name': root_path.name if root_path.name else str(root_path),
             'type': 'directory',
             'path': str(root_path.absolute()),
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': _fmt_ts(time.time()),
             'contents': []
         }
+    
+    def _iter_tree(self, root_path: Path, root_node: Dict[str, Any],
+                   exclude_path: Optional[Path] = None) -> Iterator[Tuple[str, Dict[str, Any], Optional[Path]]]:
+        """
+        Walk the directory tree iteratively and yield events in output order.
         
-        try:
-            # Get all items in the directory
-            items = list(root_path.iterdir())
-            items.sort(key=lambda x: (x.is_file(), x.name.lower()))
+        Args:
+            root_path: Root directory to scan
+            root_node: Node describing the root directory
+            exclude_path: File to leave out of the scan (e.g. the output being written)
+            
+        Yields:
+            ('enter', directory_node, None) when a directory starts,
+            ('file', file_info, file_path) for each file, where file_path is set when
+            its contents still need to be read, and
+            ('exit', directory_node, None) once all of a directory's children are done
+        """
+        exclude_name = exclude_path.name if exclude_path is not None else None
+        exclude_abs = os.path.abspath(exclude_path) if exclude_path is not None else None
+        
+        yield 'enter', root_node, None
+        stack = [(root_node, self._list_directory(root_node, root_path))]
+        while stack:
+            node, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                yield 'exit', node, None
+                continue
             
-            for item in items:
-                if self.should_ignore(item):
-                    self.stats['ignored'] += 1
+            if entry.is_dir(follow_symlinks=False):
+                self.stats['directories'] += 1
+                subdir_node = {
+                    'name': entry.name,
+                    'type': 'directory',
+                    'contents': []
+                }
+                yield 'enter', subdir_node, None
+                self._log.debug('  Scanning subdirectory: %s', entry.path)
+                stack.append((subdir_node, self._list_directory(subdir_node, entry.path)))
+            
+            elif entry.is_file():
+                if entry.name == exclude_name and os.path.abspath(entry.path) == exclude_abs:
                     continue
-                
-                if item.is_file():
-                    self.stats['files'] += 1
-                    file_info = self.get_file_info(item)
-                    result['contents'].append(file_info)
-                
-                elif item.is_dir():
-                    self.stats['directories'] += 1
-                    # Recursively scan subdirectory
-                    subdir_data = self._scan_subdirectory(item)
-                    result['contents'].append(subdir_data)
-        
-        except PermissionError as e:
-            if self.verbose:
-                print(f"Warning: Permission denied accessing {root_path}: {e}")
-            result['error'] = f"Permission denied: {e}"
-        except Exception as e:
-            if self.verbose:
-                print(f"Warning: Error scanning {root_path}: {e}")
-            result['error'] = str(e)
-        
-        return result
+                self.stats['files'] += 1
+                file_info, file_path = self._get_file_metadata(entry)
+                yield 'file', file_info, file_path
     
-    def _scan_subdirectory(self, dir_path: Path) -> Dict[str, Any]:
+    def _list_directory(self, node: Dict[str, Any], dir_path) -> Iterator[os.DirEntry]:
         """
-        Scan a subdirectory recursively.
+        List the entries of a directory that are not ignored.
+        
+        Directories come first, then files, each sorted case-insensitively. Ignored
+        entries are dropped while the listing is read, before sorting, so an ignored
+        folder is never handed back to the walker and never scanned. Errors are
+        recorded on the directory node rather than raised.
         
         Args:
-            dir_path: Directory path to scan
+            node: Directory node receiving any error message
+            dir_path: Directory to list
             
         Returns:
-            Dictionary representing the subdirectory structure
+            Iterator over the directory entries to include
         """
-        if self.verbose:
-            print(f"  Scanning subdirectory: {dir_path}")
-        
-        result = {
-            'name': dir_path.name,
-            'type': 'directory',
-            'contents': []
-        }
-        
+        dirs, files = [], []
         try:
-            items = list(dir_path.iterdir())
-            items.sort(key=lambda x: (x.is_file(), x.name.lower()))
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if self.should_ignore(entry.name, is_dir, entry.path):
+                        self.stats['ignored'] += 1
+                        continue
+                    if not is_dir and entry.is_symlink() and entry.is_dir():
+                        # Directory symlinks are not followed, so they count as ignored
+                        self._log.debug('Ignoring (directory symlink): %s', entry.path)
+                        self.stats['ignored'] += 1
+                        continue
+                    (dirs if is_dir else files).append(entry)
             
-            for item in items:
-                if self.should_ignore(item):
-                    self.stats['ignored'] += 1
-                    continue
-                
-                if item.is_file():
-                    self.stats['files'] += 1
-                    file_info = self.get_file_info(item)
-                    result['contents'].append(file_info)
-                
-                elif item.is_dir():
-                    self.stats['directories'] += 1
-                    # Recursively scan subdirectory
-                    subdir_data = self._scan_subdirectory(item)
-                    result['contents'].append(subdir_data)
+            dirs.sort(key=lambda e: e.name.lower())
+            files.sort(key=lambda e: e.name.lower())
         
         except PermissionError as e:
-            if self.verbose:
-                print(f"Warning: Permission denied accessing {dir_path}: {e}")
-            result['error'] = f"Permission denied: {e}"
+            self._log.warning('Warning: Permission denied accessing %s: %s', dir_path, e)
+            node['error'] = f"Permission denied: {e}"
         except Exception as e:
-            if self.verbose:
-                print(f"Warning: Error scanning {dir_path}: {e}")
-            result['error'] = str(e)
+            self._log.warning('Warning: Error scanning %s: %s', dir_path, e)
+            node['error'] = str(e)
         
-        return result
+        return itertools.chain(dirs, files)
+    
+    def _iter_with_contents(self, events: Iterator[Tuple[str, Dict[str, Any], Optional[Path]]],
+                            encode_binary: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Fill in file contents for scan events while preserving their order.
+        
+        With 'parallel_read' enabled, each read is submitted to a thread pool as soon
+        as the file is discovered, and up to READ_AHEAD reads are kept in flight ahead
+        of the consumer. Disk I/O overlaps with traversal and output while the number
+        of file contents held in memory stays bounded.
+        
+        Args:
+            events: Events produced by _iter_tree
+            encode_binary: Passed through to _get_file_contents
+            
+        Yields:
+            (kind, node) pairs, with 'contents' set on files that capture contents
+        """
+        if not self._capture_contents or not self.config.get('parallel_read', True):
+            for kind, node, file_path in events:
+                if file_path is not None:
+                    node['contents'] = self._get_file_contents(file_path, encode_binary, node.get('size'))
+                yield kind, node
+            return
+        
+        window = deque()
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            for kind, node, file_path in events:
+                future = None
+                if file_path is not None:
+                    future = executor.submit(self._get_file_contents, file_path, encode_binary, node.get('size'))
+                    in_flight += 1
+                window.append((kind, node, future))
+                
+                # Hand over everything at the front that is ready, blocking only
+                # when the read-ahead limit has been reached
+                while window:
+                    kind, node, future = window[0]
+                    if future is not None:
+                        if in_flight < self.READ_AHEAD and not future.done():
+                            break
+                        node['contents'] = future.result()
+                        in_flight -= 1
+                    window.popleft()
+                    yield kind, node
+            
+            for kind, node, future in window:
+                if future is not None:
+                    node['contents'] = future.result()
+                yield kind, node
     
     def save_to_json(self, data: Dict[str, Any], output_path: Path) -> None:
         """
@@ -336,57 +691,56 @@ class DirectoryPackager:
             output_path: Path to save the JSON file
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # Same layout as json.dump(indent=2, ensure_ascii=False), encoded in C
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
             raise Exception(f"Failed to save JSON file: {e}")
     
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Mapping[str, int]:
         """
         Get statistics from the last scan operation.
         
         Returns:
-            Dictionary containing scan statistics
+            Read-only view of the scan statistics
         """
-        return self.stats.copy()
+        return MappingProxyType(self.stats)
     
-    def _should_capture_contents(self, file_path: Path) -> bool:
+    def _should_capture_contents(self, file_path: Union[str, Path], stat_result: os.stat_result,
+                                 extension: Optional[str] = None) -> bool:
         """
         Check if file contents should be captured based on configuration.
         
         Args:
             file_path: Path to the file
+            stat_result: Stat information already gathered for the file
+            extension: Lowercased file extension, if already known
             
         Returns:
             True if contents should be captured, False otherwise
         """
         # Check if content capture is enabled
-        if not self.config.get('capture_contents', True):
+        if not self._capture_contents:
             return False
         
         # Check file size limit
-        max_size = self.config.get('max_content_size', 10 * 1024 * 1024)  # 10MB default
-        try:
-            if file_path.stat().st_size > max_size:
-                if self.verbose:
-                    print(f"Skipping contents for large file: {file_path} ({file_path.stat().st_size} bytes)")
-                return False
-        except (OSError, IOError):
+        if stat_result.st_size > self._max_content_size:
+            self._log.debug('Skipping contents for large file: %s (%d bytes)', file_path, stat_result.st_size)
             return False
         
         # Check if extension is in capture list (if specified)
-        capture_extensions = self.config.get('capture_extensions', [])
-        if capture_extensions:
-            extension = file_path.suffix.lower()
-            if extension not in capture_extensions:
-                return False
+        if extension is None:
+            extension = _file_extension(os.path.basename(file_path))
+        if self._capture_ext and extension not in self._capture_ext:
+            return False
         
         # Check if extension is in no-capture list
-        no_capture_extensions = self.config.get('no_capture_extensions', [])
-        if no_capture_extensions:
-            extension = file_path.suffix.lower()
-            if extension in no_capture_extensions:
-                return False
+        if extension in self._no_capture_ext:
+            return False
         
         return True
     
@@ -400,82 +754,132 @@ class DirectoryPackager:
         Returns:
             True if the file should be treated as binary
         """
-        binary_extensions = {
-            # Office documents
-            '.xlsx', '.xls', '.docx', '.doc', '.pptx', '.ppt',
-            # Archives
-            '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2',
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.tiff', '.svg',
-            # Audio/Video
-            '.mp3', '.mp4', '.avi', '.mkv', '.wav', '.ogg',
-            # Executables
-            '.exe', '.dll', '.so', '.dylib',
-            # Other binary formats
-            '.pdf', '.bin', '.dat', '.db', '.sqlite'
-        }
-        
-        return file_path.suffix.lower() in binary_extensions
+        return file_path.suffix.lower() in BINARY_EXTENSIONS
 
-    def _get_file_contents(self, file_path: Path) -> Dict[str, Any]:
+    def _get_file_contents(self, file_path: Path, encode_binary: bool = True,
+                           size: Optional[int] = None) -> Dict[str, Any]:
         """
         Get file contents, handling both text and binary files.
         
         Args:
             file_path: Path to the file
+            encode_binary: Base64-encode binary data; if False, 'data' holds the raw
+                bytes so the caller can encode them incrementally while writing
+            size: File size from an earlier stat, if known
             
         Returns:
             Dictionary containing content data
         """
         try:
-            # Check if file should be treated as binary first
-            if self._is_binary_file(file_path):
-                with open(file_path, 'rb') as f:
-                    binary_content = f.read()
-                encoded_content = base64.b64encode(binary_content).decode('ascii')
-                return {
-                    'type': 'binary',
-                    'encoding': 'base64',
-                    'data': encoded_content
-                }
+            # Decode large UTF-8 files straight from a memory map, skipping the
+            # intermediate bytes copy
+            raw = None
+            is_binary = self._is_binary_file(file_path)
+            if size is not None and size >= self.MMAP_THRESHOLD and not is_binary:
+                mapped = self._read_mapped(file_path)
+                if isinstance(mapped, str):
+                    return self._text_contents(mapped, 'utf-8')
+                raw = mapped
+            # Bytes back from the map mean it sniffed as binary or already failed UTF-8
+            utf8_tried = raw is not None
             
-            # Try to read as text first
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return {
-                    'type': 'text',
-                    'encoding': 'utf-8',
-                    'data': content
-                }
-            except UnicodeDecodeError:
-                # Try other common encodings
-                for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                    try:
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            content = f.read()
-                        return {
-                            'type': 'text',
-                            'encoding': encoding,
-                            'data': content
-                        }
-                    except UnicodeDecodeError:
-                        continue
-                
-                # If all text encodings fail, treat as binary
+            # Read the file once; all decoding happens in memory
+            if raw is None:
                 with open(file_path, 'rb') as f:
-                    binary_content = f.read()
-                encoded_content = base64.b64encode(binary_content).decode('ascii')
-                return {
-                    'type': 'binary',
-                    'encoding': 'base64',
-                    'data': encoded_content
-                }
+                    raw = f.read()
+            
+            # Binary by extension, or by a NUL byte near the start, which text never has
+            if is_binary or b'\x00' in raw[:self.SNIFF_SIZE]:
+                return self._binary_contents(raw, encode_binary)
+            
+            # Fast path: most text files are UTF-8
+            if not utf8_tried:
+                try:
+                    return self._text_contents(raw.decode('utf-8'), 'utf-8')
+                except UnicodeDecodeError:
+                    pass
+            
+            if charset_normalizer is not None:
+                best_match = charset_normalizer.from_bytes(raw).best()
+                if best_match is None:
+                    return self._binary_contents(raw, encode_binary)
+                return self._text_contents(raw.decode(best_match.encoding), best_match.encoding)
+            
+            # Without detection, latin-1 decodes any byte sequence
+            return self._text_contents(raw.decode('latin-1'), 'latin-1')
                 
         except Exception as e:
-            if self.verbose:
-                print(f"Warning: Could not read contents of {file_path}: {e}")
+            self._log.warning('Warning: Could not read contents of %s: %s', file_path, e)
             return {
                 'type': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    def _read_mapped(self, file_path: Path) -> Union[str, bytes, None]:
+        """
+        Decode a file as UTF-8 through a read-only memory map.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Decoded text; the raw bytes if the file looks binary or is not valid
+            UTF-8, so it need not be read again; or None if the file is empty
+        """
+        with open(file_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return None
+            try:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                # Files that sniff as binary are left to the regular decoding
+                if mm.find(b'\x00', 0, self.SNIFF_SIZE) == -1:
+                    try:
+                        return str(mm, 'utf-8')
+                    except UnicodeDecodeError:
+                        pass
+                return mm[:]
+            finally:
+                mm.close()
+    
+    def _text_contents(self, text: str, encoding: str) -> Dict[str, Any]:
+        """
+        Build the content object for decoded text.
+        
+        Line endings are normalized to '\\n', matching what reading the file in
+        text mode with universal newlines produces.
+        
+        Args:
+            text: Decoded file contents
+            encoding: Encoding the contents were decoded with
+            
+        Returns:
+            Dictionary containing content data
+        """
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return {
+            'type': 'text',
+            'encoding': encoding,
+            'data': text
+        }
+    
+    def _binary_contents(self, binary_content: bytes, encode: bool) -> Dict[str, Any]:
+        """
+        Build the content object for binary data.
+        
+        Args:
+            binary_content: Raw file bytes
+            encode: Base64-encode the data now instead of leaving it as bytes
+            
+        Returns:
+            Dictionary containing content data
+        """
+        return {
+            'type': 'binary',
+            'encoding': 'base64',
+            'data': base64.b64encode(binary_content).decode('ascii') if encode else binary_content
+        }
\ No newline at end of file
@@ -8,10 +8,17 @@ import argparse
 import json
 import sys
 import base64
+import os
+import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Union
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional: C implementation of JSON parsing
+    orjson = None
+
 
 def main():
     """Main entry point for the directory extractor application."""
@@ -57,8 +64,12 @@ def main():
         if args.verbose:
             print(f"Loading JSON file: {json_path.absolute()}")
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            directory_data = json.load(f)
+        if orjson is not None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so errors are handled below
+            directory_data = orjson.loads(json_path.read_bytes())
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                directory_data = json.load(f)
 
         # Validate JSON structure
         if not isinstance(directory_data, dict) or directory_data.get('type') != 'directory':
@@ -108,6 +119,12 @@ def main():
 class DirectoryExtractor:
     """Handles extraction of directory structures from JSON data."""
     
+    # Base64 characters decoded per step; a multiple of 4 so every piece decodes on its own
+    DECODE_CHUNK_SIZE = 64 * 1024
+    
+    # Line breaks or other whitespace in a base64 payload (e.g. from base64.encodebytes)
+    _BASE64_WHITESPACE = re.compile(r'\s')
+    
     def __init__(self, verbose: bool = False, overwrite: bool = False):
         """
         Initialize the DirectoryExtractor.
@@ -139,58 +156,53 @@ class DirectoryExtractor:
         self.stats = {'directories': 0, 'files': 0, 'errors': 0}
         
         # Create the root directory
-        self._create_directory(output_path)
+        # Paths are handled as plain strings below; os.path.join is much cheaper than Path /
+        output_dir = str(output_path)
+        self._create_directory(output_dir)
         
         # Process contents
-        contents = directory_data.get('contents', [])
-        for item in contents:
-            try:
-                item_path = output_path / item['name']
-                
-                if item['type'] == 'directory':
-                    self._extract_subdirectory(item, item_path)
-                elif item['type'] == 'file':
-                    self._extract_file(item, item_path)
-                else:
-                    if self.verbose:
-                        print(f"Warning: Unknown item type '{item['type']}' for {item['name']}")
-                    
-            except Exception as e:
-                self.stats['errors'] += 1
-                if self.verbose:
-                    print(f"Error processing {item.get('name', 'unknown')}: {e}")
+        self._extract_contents(directory_data, output_dir)
     
-    def _extract_subdirectory(self, directory_data: Dict[str, Any], directory_path: Path) -> None:
+    def _extract_contents(self, directory_data: Dict[str, Any], directory_path: str) -> None:
         """
-        Extract a subdirectory recursively.
+        Extract the contents of a directory, walking subdirectories iteratively.
+        
+        Items are created in the same depth-first order as they appear in the JSON,
+        without recursion, so deeply nested trees do not hit the recursion limit.
         
         Args:
             directory_data: Directory data dictionary
-            directory_path: Path where to create the directory
+            directory_path: Path of the already created directory
         """
-        if self.verbose:
-            print(f"  Creating directory: {directory_path}")
-        
-        # Create the directory
-        self._create_directory(directory_path)
-        
-        # Process contents
-        contents = directory_data.get('contents', [])
-        for item in contents:
+        stack = [(directory_path, iter(directory_data.get('contents', [])))]
+        while stack:
+            parent_path, items = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            
             try:
-                item_path = directory_path / item['name']
+                item_path = os.path.join(parent_path, item['name'])
                 
                 if item['type'] == 'directory':
-                    self._extract_subdirectory(item, item_path)
+                    if self.verbose:
+                        print(f"  Creating directory: {item_path}")
+                    self._create_directory(item_path)
+                    stack.append((item_path, iter(item.get('contents', []))))
                 elif item['type'] == 'file':
                     self._extract_file(item, item_path)
+                elif len(stack) == 1:
+                    # Unknown types are only reported for top-level items
+                    if self.verbose:
+                        print(f"Warning: Unknown item type '{item['type']}' for {item['name']}")
                     
             except Exception as e:
                 self.stats['errors'] += 1
                 if self.verbose:
                     print(f"Error processing {item.get('name', 'unknown')}: {e}")
     
-    def _create_directory(self, directory_path: Path) -> None:
+    def _create_directory(self, directory_path: str) -> None:
         """
         Create a directory.
         
@@ -198,11 +210,11 @@ class DirectoryExtractor:
             directory_path: Path of the directory to create
         """
         try:
-            if directory_path.exists() and not self.overwrite:
+            if os.path.exists(directory_path) and not self.overwrite:
                 if self.verbose:
                     print(f"Directory already exists: {directory_path}")
             else:
-                directory_path.mkdir(parents=True, exist_ok=True)
+                os.makedirs(directory_path, exist_ok=True)
                 self.stats['directories'] += 1
                 
         except Exception as e:
@@ -210,7 +222,7 @@ class DirectoryExtractor:
             if self.verbose:
                 print(f"Error creating directory {directory_path}: {e}")
     
-    def _extract_file(self, file_data: Dict[str, Any], file_path: Path) -> None:
+    def _extract_file(self, file_data: Dict[str, Any], file_path: str) -> None:
         """
         Extract a file from JSON data.
         
@@ -223,7 +235,7 @@ class DirectoryExtractor:
         
         try:
             # Check if file exists and overwrite is disabled
-            if file_path.exists() and not self.overwrite:
+            if os.path.exists(file_path) and not self.overwrite:
                 if self.verbose:
                     print(f"File already exists, skipping: {file_path}")
                 return
@@ -231,7 +243,7 @@ class DirectoryExtractor:
             # Check if file has contents
             if 'contents' not in file_data:
                 # Create empty file if no contents
-                file_path.touch()
+                open(file_path, 'ab').close()
                 self.stats['files'] += 1
                 return
             
@@ -239,20 +251,17 @@ class DirectoryExtractor:
             
             # Handle different content types
             if contents.get('type') == 'text':
-                # Text file
+                # Text file, encoded in one call rather than through a text-mode file
                 data = contents.get('data', '')
                 encoding = contents.get('encoding', 'utf-8')
-                
-                with open(file_path, 'w', encoding=encoding) as f:
-                    f.write(data)
+                if os.linesep != '\n':
+                    data = data.replace('\n', os.linesep)
+                chunks = [data.encode(encoding)]
                     
             elif contents.get('type') == 'binary':
                 # Binary file
-                data = contents.get('data', '')
                 if contents.get('encoding') == 'base64':
-                    binary_data = base64.b64decode(data)
-                    with open(file_path, 'wb') as f:
-                        f.write(binary_data)
+                    chunks = self._decode_base64(contents.get('data', ''))
                 else:
                     raise ValueError(f"Unsupported binary encoding: {contents.get('encoding')}")
                     
@@ -260,27 +269,75 @@ class DirectoryExtractor:
                 # File had read error, create empty file
                 if self.verbose:
                     print(f"Original file had read error, creating empty file: {file_path}")
-                file_path.touch()
+                open(file_path, 'ab').close()
+                self.stats['files'] += 1
+                self._set_modified_time(file_data, file_path)
+                return
                 
             else:
                 raise ValueError(f"Unsupported content type: {contents.get('type')}")
             
-            self.stats['files'] += 1
-            
-            # Set file modification time if available
-            if 'modified' in file_data:
+            # Contents are decoded lazily, so write beside the target and move into place
+            # only once everything decoded; a bad payload never truncates the real file
+            partial_path = os.path.join(os.path.dirname(file_path), f".{os.path.basename(file_path)}.partial")
+            try:
+                with open(partial_path, 'wb') as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                    f.flush()
+                    
+                    # Set the modification time through the open descriptor where supported
+                    self._set_modified_time(file_data, f.fileno() if os.utime in os.supports_fd else partial_path)
+                os.replace(partial_path, file_path)
+            except BaseException:
                 try:
-                    import os
-                    modified_time = datetime.fromisoformat(file_data['modified']).timestamp()
-                    os.utime(file_path, (modified_time, modified_time))
-                except (ValueError, OSError):
-                    pass  # Ignore timestamp errors
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+                raise
+            
+            self.stats['files'] += 1
                     
         except Exception as e:
             self.stats['errors'] += 1
             if self.verbose:
                 print(f"Error creating file {file_path}: {e}")
     
+    def _decode_base64(self, data: str) -> Iterator[bytes]:
+        """
+        Decode base64 text piece by piece.
+        
+        Whitespace is removed first, since it would shift the pieces off the
+        4-character boundaries they need to decode on their own.
+        
+        Args:
+            data: Base64-encoded file contents
+            
+        Yields:
+            Decoded bytes, at most DECODE_CHUNK_SIZE characters' worth at a time
+        """
+        if self._BASE64_WHITESPACE.search(data):
+            data = ''.join(data.split())
+        for start in range(0, len(data), self.DECODE_CHUNK_SIZE):
+            yield base64.b64decode(data[start:start + self.DECODE_CHUNK_SIZE])
+    
+    def _set_modified_time(self, file_data: Dict[str, Any], target: Union[int, str]) -> None:
+        """
+        Restore a file's modification time if the JSON records one.
+        
+        Args:
+            file_data: File data dictionary
+            target: Open file descriptor or path of the extracted file
+        """
+        if 'modified' in file_data:
+            try:
+                modified_time = file_data['modified']
+                if isinstance(modified_time, str):
+                    modified_time = datetime.fromisoformat(modified_time).timestamp()
+                os.utime(target, (modified_time, modified_time))
+            except (ValueError, OSError):
+                pass  # Ignore timestamp errors
+    
     def get_stats(self) -> Dict[str, int]:
         """
         Get statistics from the last extraction operation.
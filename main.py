@@ -6,6 +6,8 @@ Generates packaged JSON files from directory structures with configurable ignore
 
 import argparse
 import json
+import logging
+import re
 import sys
 from pathlib import Path
 from typing import Optional
@@ -14,6 +16,9 @@ from datetime import datetime
 from directory_packager import DirectoryPackager
 from config_manager import ConfigManager
 
+# Characters stripped from folder names when building output filenames
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w.-]+')
+
 
 def main():
     """Main entry point for the directory packager application."""
@@ -45,6 +50,15 @@ def main():
 
     args = parser.parse_args()
 
+    if args.verbose:
+        # Verbose packager messages are printed to stdout as plain lines
+        log_handler = logging.StreamHandler(sys.stdout)
+        log_handler.setFormatter(logging.Formatter('%(message)s'))
+        package_log = logging.getLogger('directory_packager')
+        package_log.addHandler(log_handler)
+        package_log.setLevel(logging.DEBUG)
+        package_log.propagate = False
+
     try:
         # Validate root directory
         root_path = Path(args.root_directory)
@@ -60,13 +74,10 @@ def main():
         config_manager = ConfigManager(args.config)
         config = config_manager.load_config()
         
+        abs_root = root_path.absolute()
         if args.verbose:
             print(f"Using configuration: {args.config}")
-            print(f"Scanning directory: {root_path.absolute()}")
-
-        # Create packager and generate JSON
-        packager = DirectoryPackager(config, verbose=args.verbose)
-        directory_data = packager.scan_directory(root_path)
+            print(f"Scanning directory: {abs_root}")
 
         # Save to output file in outputs directory
         outputs_dir = Path("outputs")
@@ -74,15 +85,12 @@ def main():
         
         # Generate filename if not provided
         if args.output is None:
-            # Get folder name and clean it for filename use
-            if root_path.name:
-                folder_name = root_path.name
-            else:
-                # For current directory, get the actual folder name
-                folder_name = root_path.resolve().name
+            # Get folder name (for the current directory, the actual folder name)
+            # and clean it for filename use
+            folder_name = root_path.name or abs_root.name
             
-            # Replace invalid filename characters
-            folder_name = "".join(c for c in folder_name if c.isalnum() or c in ('-', '_', '.')).strip()
+            # Remove invalid filename characters
+            folder_name = UNSAFE_FILENAME_CHARS.sub('', folder_name)
             if not folder_name:
                 folder_name = "directory"
             
@@ -97,7 +105,9 @@ def main():
             if not output_path.is_absolute() and len(output_path.parts) == 1:
                 output_path = outputs_dir / output_path
         
-        packager.save_to_json(directory_data, output_path)
+        # Create packager and write JSON while scanning
+        packager = DirectoryPackager(config, verbose=args.verbose)
+        packager.stream_scan_to_json(root_path, output_path)
 
         print(f"Successfully generated packaged JSON: {output_path.absolute()}")
         
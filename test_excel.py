@@ -2,28 +2,74 @@
 import json
 import base64
 import hashlib
+import mmap
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def new_hasher(data=b''):
+    """BLAKE3 when installed, otherwise hashlib's BLAKE2b."""
+    if blake3 is not None:
+        return blake3.blake3(data, max_threads=blake3.blake3.AUTO)
+    return hashlib.blake2b(data)
+
+# Bytes read (and base64 characters decoded, a multiple of 4) per step
+CHUNK_SIZE = 1024 * 1024
 
 def get_file_hash(path):
-    with open(path, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+    hasher = new_hasher()
+    buffer = bytearray(CHUNK_SIZE)
+    with open(path, 'rb', buffering=0) as f, memoryview(buffer) as view:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+def hash_base64(data):
+    """Decode base64 text piece by piece, returning (decoded size, hash)."""
+    hasher = new_hasher()
+    size = 0
+    for start in range(0, len(data), CHUNK_SIZE):
+        chunk = base64.b64decode(data[start:start + CHUNK_SIZE])
+        size += len(chunk)
+        hasher.update(chunk)
+    return size, hasher.hexdigest()
 
 def find_file(data, filename):
-    """Recursively find a file in the JSON structure."""
-    if isinstance(data, list):
-        for item in data:
-            result = find_file(item, filename)
-            if result:
-                return result
-    elif isinstance(data, dict):
-        if data.get('type') == 'file' and filename in data.get('name', ''):
-            return data
-        if 'contents' in data:
-            return find_file(data['contents'], filename)
+    """Find a file by name in the JSON structure (depth-first, without recursion)."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            # Reversed so items are visited in their original order
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if node.get('type') == 'file' and node.get('name') == filename:
+                return node
+            if 'contents' in node:
+                stack.append(node['contents'])
     return None
 
+def load_json(path):
+    """Parse a packaged JSON file, straight from a memory map when orjson is installed."""
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
 # Load the JSON
-with open('outputs/cross_db_validator_20251007_055637.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json('outputs/cross_db_validator_20251007_055637.json')
 
 # Find the Excel file
 result = find_file(data['contents'], 'test_suite.xlsx')
@@ -37,18 +83,17 @@ if result:
     # Test the base64 decoding
     if contents.get('encoding') == 'base64':
         try:
-            decoded_data = base64.b64decode(contents.get('data', ''))
-            print(f'Decoded size: {len(decoded_data)}')
+            decoded_size, decoded_hash = hash_base64(contents.get('data', ''))
+            print(f'Decoded size: {decoded_size}')
             
             # Get original file size
             import os
             orig_size = os.path.getsize('C:/MyProjects/cross_db_validator/inputs/test_suite.xlsx')
             print(f'Original size: {orig_size}')
-            print(f'Size match: {len(decoded_data) == orig_size}')
+            print(f'Size match: {decoded_size == orig_size}')
             
             # Test if decoded data matches original
             orig_hash = get_file_hash('C:/MyProjects/cross_db_validator/inputs/test_suite.xlsx')
-            decoded_hash = hashlib.md5(decoded_data).hexdigest()
             print(f'Original hash: {orig_hash}')
             print(f'Decoded hash: {decoded_hash}')
             print(f'Hash match: {orig_hash == decoded_hash}')
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Checks that validation reports are written for file names that are not valid UTF-8."""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import validator
+
+VALIDATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'validator.py')
+
+# On Linux a byte that is not valid UTF-8 comes back from os.fsdecode as a lone surrogate
+UNDECODABLE_NAME = os.fsdecode(b'\xff.txt')
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'needs a filesystem that accepts any bytes in names')
+class ReportEncodingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.original = os.path.join(self.tmp.name, 'original')
+        self.extracted = os.path.join(self.tmp.name, 'extracted')
+        os.makedirs(self.original)
+        os.makedirs(self.extracted)
+        # Only in the original tree, so its name ends up in the report's error list
+        with open(os.path.join(os.fsencode(self.original), b'\xff.txt'), 'wb') as f:
+            f.write(b'data')
+
+    def run_validator(self, *options):
+        return subprocess.run([sys.executable, VALIDATOR, self.original, self.extracted, *options],
+                              capture_output=True, text=True, errors='replace')
+
+    def assert_reports_missing_file(self, errors):
+        self.assertTrue(any(UNDECODABLE_NAME in error for error in errors), errors)
+
+    def test_save_report(self):
+        report_path = os.path.join(self.tmp.name, 'report.json')
+        result = self.run_validator('--save-report', report_path)
+        self.assertEqual(result.returncode, 1, result.stderr)
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertFalse(report['validation_passed'])
+        self.assert_reports_missing_file(report['errors'])
+
+    def test_save_report_ndjson(self):
+        report_path = os.path.join(self.tmp.name, 'report.ndjson')
+        result = self.run_validator('--save-report-ndjson', report_path)
+        self.assertEqual(result.returncode, 1, result.stderr)
+        with open(report_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]['type'], 'summary')
+        self.assert_reports_missing_file([r['message'] for r in records if r['type'] == 'error'])
+
+    def test_encode_without_orjson(self):
+        report = {'errors': [f"Missing file: {UNDECODABLE_NAME}"]}
+        with mock.patch.object(validator, 'orjson', None):
+            for indent in (False, True):
+                self.assertEqual(json.loads(validator.encode_report_json(report, indent)), report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,22 +8,74 @@ by comparing file counts, sizes, content, and directory structure.
 
 import os
 import sys
-import hashlib
 import argparse
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Callable, Dict, List, Optional, Tuple, Set
 import json
 from datetime import datetime
 import fnmatch
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Optional: C implementation of indented JSON output
+    orjson = None
+
+
+# Access-pattern hints for posix_fadvise (None where the platform has no fadvise)
+FADV_SEQUENTIAL = getattr(os, 'POSIX_FADV_SEQUENTIAL', None)
+FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+
+def fadvise(f, advice: Optional[int]):
+    """Tell the kernel how a whole open file will be used; a no-op where unsupported."""
+    if advice is not None:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, advice)
+        except OSError:
+            pass  # Only a hint, e.g. not supported by this filesystem
+
+
+# Extensions treated as binary (compared with a size tolerance)
+BINARY_EXTENSIONS = frozenset({
+    '.xlsx', '.xls', '.doc', '.docx', '.pdf', '.zip', '.rar', '.7z', 
+    '.tar', '.gz', '.exe', '.dll', '.so', '.dylib', '.bin', '.img', 
+    '.iso', '.mp3', '.mp4', '.avi', '.mkv', '.jpg', '.jpeg', '.png', 
+    '.gif', '.bmp', '.tiff'
+})
+
 
 class DirectoryValidator:
-    def __init__(self, original_path: str, extracted_path: str, verbose: bool = False):
+    # Directory names that are always ignored in the original tree
+    ESSENTIAL_IGNORES = frozenset(('.git', '__pycache__'))
+    
+    # Size of each reusable buffer used when comparing file contents
+    READ_BUFFER_SIZE = 1024 * 1024
+    
+    # Trees with more files than this compare contents on a thread pool
+    PARALLEL_COMPARE_MIN_FILES = 8
+    
+    # Log lines collected before they are written to stdout in one go
+    LOG_FLUSH_LINES = 1000
+    
+    # Threads listing directories ahead of the scan (bounded to limit open descriptors)
+    SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+    
+    def __init__(self, original_path: str, extracted_path: str, verbose: bool = False, quick: bool = False):
         self.original_path = Path(original_path)
         self.extracted_path = Path(extracted_path)
         self.verbose = verbose
+        # Trust matching size and modification time instead of reading contents
+        self.quick = quick
         self.errors = []
         self.warnings = []
         
+        # Per-file messages are buffered and written in blocks instead of one print each
+        self._log_buffer = []
+        self._log_lock = threading.Lock()
+        
         # .gitignore support
         self.use_gitignore = False
         self.gitignore_patterns = []
@@ -37,6 +89,11 @@ class DirectoryValidator:
             'ignore_extensions': []
         }
         
+        # Patterns compiled into one regex each for files and for directories
+        self._gitignore_file_re = self._gitignore_dir_re = self._compile_patterns([])
+        self._config_file_re = self._config_dir_re = self._compile_patterns([])
+        self._ignore_extensions = ()
+        
         self.stats = {
             'total_files_original': 0,
             'total_files_extracted': 0,
@@ -57,17 +114,33 @@ class DirectoryValidator:
     def log_verbose(self, message: str):
         """Log verbose output if verbose mode is enabled."""
         if self.verbose:
-            print(f"  {message}")
+            self._write_log(f"  {message}")
 
     def log_error(self, message: str):
         """Log an error."""
         self.errors.append(message)
-        print(f"ERROR: {message}")
+        self._write_log(f"ERROR: {message}")
+        self.flush_log()
 
     def log_warning(self, message: str):
         """Log a warning."""
         self.warnings.append(message)
-        print(f"WARNING: {message}")
+        self._write_log(f"WARNING: {message}")
+
+    def _write_log(self, line: str):
+        """Buffer a log line, writing the buffer out once it is full."""
+        with self._log_lock:
+            self._log_buffer.append(line)
+            full = len(self._log_buffer) >= self.LOG_FLUSH_LINES
+        if full:
+            self.flush_log()
+
+    def flush_log(self):
+        """Write out buffered log lines."""
+        with self._log_lock:
+            if self._log_buffer:
+                sys.stdout.write('\n'.join(self._log_buffer) + '\n')
+                self._log_buffer.clear()
 
     def load_gitignore(self, source_path: Path) -> bool:
         """
@@ -94,6 +167,14 @@ class DirectoryValidator:
                     if line and not line.startswith('#'):
                         self.gitignore_patterns.append(line)
                 
+                # Negation patterns are not supported; patterns ending in '/' only match directories
+                file_patterns = [p for p in self.gitignore_patterns
+                                 if not p.startswith('!') and not p.endswith('/')]
+                dir_only_patterns = [p[:-1] for p in self.gitignore_patterns
+                                     if not p.startswith('!') and p.endswith('/')]
+                self._gitignore_file_re = self._compile_patterns(file_patterns)
+                self._gitignore_dir_re = self._compile_patterns(file_patterns + dir_only_patterns)
+                
                 self.use_gitignore = True
                 if self.verbose:
                     print(f">> Loaded .gitignore with {len(self.gitignore_patterns)} patterns from: {gitignore_path}")
@@ -124,6 +205,14 @@ class DirectoryValidator:
                 self.config_patterns['ignore_paths'] = config.get('ignore_paths', [])
                 self.config_patterns['ignore_extensions'] = config.get('ignore_extensions', [])
                 
+                # Folder patterns only apply to directories
+                file_patterns = (self.config_patterns['ignore_file_patterns'] +
+                                 self.config_patterns['ignore_paths'])
+                self._config_file_re = self._compile_patterns(file_patterns)
+                self._config_dir_re = self._compile_patterns(
+                    file_patterns + self.config_patterns['ignore_folder_patterns'])
+                self._ignore_extensions = tuple(ext.lower() for ext in self.config_patterns['ignore_extensions'])
+                
                 total_patterns = (len(self.config_patterns['ignore_file_patterns']) + 
                                 len(self.config_patterns['ignore_folder_patterns']) + 
                                 len(self.config_patterns['ignore_paths']) + 
@@ -139,12 +228,33 @@ class DirectoryValidator:
             if self.verbose:
                 print(f">> No config.json found, using minimal default patterns")
     
-    def matches_gitignore_pattern(self, path: Path) -> bool:
+    def _compile_patterns(self, patterns: List[str]) -> 're.Pattern':
+        """Combine fnmatch-style patterns into one compiled regex (never matches if empty)."""
+        if not patterns:
+            return re.compile(r'(?!)')
+        # Normalize case the same way fnmatch.fnmatch does for the current platform
+        return re.compile('|'.join(
+            f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in patterns
+        ))
+
+    def _matches_compiled(self, pattern_re: 're.Pattern', name: str, path_str: str) -> bool:
+        """Check a compiled pattern against an entry's name or its relative path."""
+        return bool(pattern_re.match(os.path.normcase(name)) or
+                    pattern_re.match(os.path.normcase(path_str)))
+
+    def _relative_path(self, path: Path) -> str:
+        """Path relative to the source root with '/' separators (ValueError if outside it)."""
+        return str(path.relative_to(self.source_root)).replace('\\', '/')
+
+    def matches_gitignore_pattern(self, path: Path, is_dir: Optional[bool] = None,
+                                  rel_path: Optional[str] = None) -> bool:
         """
         Check if a path matches any .gitignore pattern.
         
         Args:
             path: Path to check (relative to source root)
+            is_dir: Whether the path is a directory, if already known
+            rel_path: Path relative to the source root with '/' separators, if already known
             
         Returns:
             True if the path should be ignored according to .gitignore
@@ -154,30 +264,13 @@ class DirectoryValidator:
         
         try:
             # Get relative path from source root
-            rel_path = path.relative_to(self.source_root)
-            path_str = str(rel_path).replace('\\', '/')
-            name = path.name
+            path_str = self._relative_path(path) if rel_path is None else rel_path
+            if is_dir is None:
+                is_dir = path.is_dir()
             
-            for pattern in self.gitignore_patterns:
-                # Handle negation patterns (starting with !)
-                if pattern.startswith('!'):
-                    continue  # Skip negation patterns for now (complex logic)
-                
-                # Handle directory patterns (ending with /)
-                if pattern.endswith('/'):
-                    if path.is_dir():
-                        dir_pattern = pattern[:-1]
-                        if fnmatch.fnmatch(name, dir_pattern) or fnmatch.fnmatch(path_str, dir_pattern):
-                            return True
-                else:
-                    # Handle file and directory patterns
-                    if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path_str, pattern):
-                        return True
-                    
-                    # Handle patterns with path separators
-                    if '/' in pattern:
-                        if fnmatch.fnmatch(path_str, pattern):
-                            return True
+            # Directory-only patterns (ending with /) are part of the directory regex
+            pattern_re = self._gitignore_dir_re if is_dir else self._gitignore_file_re
+            return self._matches_compiled(pattern_re, path.name, path_str)
         
         except ValueError:
             # Path is not relative to source_root
@@ -185,82 +278,70 @@ class DirectoryValidator:
         
         return False
     
-    def should_ignore(self, path: Path) -> bool:
+    def should_ignore(self, path: Path, is_dir: Optional[bool] = None, rel_path: Optional[str] = None) -> bool:
         """
         Check if a path should be ignored based on .gitignore patterns or default patterns.
         
         Args:
             path: Path to check
+            is_dir: Whether the path is a directory, if already known (saves a stat call)
+            rel_path: Path relative to the source root with '/' separators, if already known
             
         Returns:
             True if the path should be ignored, False otherwise
         """
+        reason = self._ignore_reason(path, is_dir, rel_path)
+        if reason:
+            self.log_verbose(f"Ignoring ({reason}): {path}")
+        return reason is not None
+    
+    def _ignore_reason(self, path: Path, is_dir: Optional[bool] = None,
+                       rel_path: Optional[str] = None) -> Optional[str]:
+        """
+        Decide whether a path is ignored without logging anything.
+        
+        Returns:
+            The kind of pattern that matched ('' for the silent defaults), or None if kept
+        """
         # First check .gitignore patterns if available
-        if self.use_gitignore and self.matches_gitignore_pattern(path):
-            if self.verbose:
-                print(f"  Ignoring (gitignore pattern): {path}")
-            return True
+        if self.use_gitignore and self.matches_gitignore_pattern(path, is_dir, rel_path):
+            return 'gitignore pattern'
         
         # If using .gitignore, don't apply default patterns (except for essential ones)
         if self.use_gitignore:
             # Only apply essential ignores when using .gitignore
-            name = path.name
-            essential_patterns = ['.git', '__pycache__']
-            if name in essential_patterns or (path.is_dir() and name in essential_patterns):
-                if self.verbose:
-                    print(f"  Ignoring (essential pattern): {path}")
-                return True
-            return False
+            if path.name in self.ESSENTIAL_IGNORES:
+                return 'essential pattern'
+            return None
         
         # Check config.json patterns if available
-        if self.matches_config_pattern(path):
-            if self.verbose:
-                print(f"  Ignoring (config pattern): {path}")
-            return True
-        
-        # Minimal default ignore patterns when no .gitignore or config
-        default_ignore_patterns = {'.git', '__pycache__'}
-        name = path.name
-        if name in default_ignore_patterns:
-            return True
+        if self.matches_config_pattern(path, is_dir, rel_path):
+            return 'config pattern'
         
-        # Skip if any parent directory is in ignore patterns
-        if any(part in default_ignore_patterns for part in path.parts):
-            return True
-        
-        return False
+        # Minimal default ignore patterns when no .gitignore or config.
+        # Parent directories need no check: ignored directories are never descended into
+        return '' if path.name in self.ESSENTIAL_IGNORES else None
     
-    def matches_config_pattern(self, path: Path) -> bool:
+    def matches_config_pattern(self, path: Path, is_dir: Optional[bool] = None,
+                               rel_path: Optional[str] = None) -> bool:
         """Check if a path matches any config.json ignore pattern."""
         if not self.source_root:
             return False
         
         try:
             # Get relative path from source root
-            rel_path = path.relative_to(self.source_root)
-            path_str = str(rel_path).replace('\\', '/')
+            path_str = self._relative_path(path) if rel_path is None else rel_path
             name = path.name
             
             # Check file extensions
-            for ext in self.config_patterns['ignore_extensions']:
-                if name.lower().endswith(ext.lower()):
-                    return True
-            
-            # Check file patterns
-            for pattern in self.config_patterns['ignore_file_patterns']:
-                if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path_str, pattern):
-                    return True
-            
-            # Check folder patterns (only for directories)
-            if path.is_dir():
-                for pattern in self.config_patterns['ignore_folder_patterns']:
-                    if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path_str, pattern):
-                        return True
+            if name.lower().endswith(self._ignore_extensions):
+                return True
             
-            # Check specific paths
-            for ignore_path in self.config_patterns['ignore_paths']:
-                if fnmatch.fnmatch(name, ignore_path) or fnmatch.fnmatch(path_str, ignore_path):
-                    return True
+            # Check file patterns and specific paths, plus folder patterns for directories
+            if is_dir is None:
+                is_dir = path.is_dir()
+            pattern_re = self._config_dir_re if is_dir else self._config_file_re
+            return self._matches_compiled(pattern_re, name, path_str)
         
         except ValueError:
             # Path is not relative to source_root
@@ -268,55 +349,74 @@ class DirectoryValidator:
         
         return False
 
-    def get_file_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of a file."""
+    def compare_file_contents(self, original_path: str, extracted_path: str, size_diff: int) -> Optional[bool]:
+        """Check whether two files have identical contents; None if they could not be read."""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            return self._compare_file_contents(original_path, extracted_path, size_diff)
         except Exception as e:
-            self.log_warning(f"Could not calculate hash for {file_path}: {e}")
-            return ""
+            self.log_warning(f"Could not compare contents of {original_path} and {extracted_path}: {e}")
+            return None
+
+    def _compare_file_contents(self, original_path: str, extracted_path: str, size_diff: int) -> bool:
+        """Check whether two files have identical contents, raising on errors (safe to run in threads)."""
+        if size_diff:
+            # Files of different sizes cannot match, no need to read them
+            return False
+        # Byte-for-byte comparison in large blocks that stops at the first difference;
+        # readinto fills the same two buffers every time instead of allocating per read
+        original_buffer = bytearray(self.READ_BUFFER_SIZE)
+        extracted_buffer = bytearray(self.READ_BUFFER_SIZE)
+        with open(original_path, 'rb') as original, open(extracted_path, 'rb') as extracted, \
+                memoryview(original_buffer) as original_view, memoryview(extracted_buffer) as extracted_view:
+            fadvise(original, FADV_SEQUENTIAL)
+            fadvise(extracted, FADV_SEQUENTIAL)
+            try:
+                while True:
+                    original_size = original.readinto(original_buffer)
+                    extracted_size = extracted.readinto(extracted_buffer)
+                    if original_size != extracted_size:
+                        return False
+                    if not original_size:
+                        return True
+                    # memoryview equality is a memcmp for byte buffers
+                    if original_view[:original_size] != extracted_view[:extracted_size]:
+                        return False
+            finally:
+                # Each file is read once; keep it from pushing hotter pages out of the cache
+                fadvise(original, FADV_DONTNEED)
+                fadvise(extracted, FADV_DONTNEED)
 
     def is_binary_file(self, file_path: str) -> bool:
         """Check if file is likely a binary file based on extension."""
-        binary_extensions = {
-            '.xlsx', '.xls', '.doc', '.docx', '.pdf', '.zip', '.rar', '.7z', 
-            '.tar', '.gz', '.exe', '.dll', '.so', '.dylib', '.bin', '.img', 
-            '.iso', '.mp3', '.mp4', '.avi', '.mkv', '.jpg', '.jpeg', '.png', 
-            '.gif', '.bmp', '.tiff'
-        }
-        return any(file_path.lower().endswith(ext) for ext in binary_extensions)
+        return os.path.splitext(file_path)[1].lower() in BINARY_EXTENSIONS
 
-    def get_size_tolerance(self, file_path: str, original_size: int) -> int:
+    def get_size_tolerance(self, file_path: str, original_size: int, is_binary: Optional[bool] = None) -> int:
         """
         Get acceptable size tolerance for a file.
         Binary files may have slight size differences due to base64 encoding/decoding.
         """
-        if self.is_binary_file(file_path):
+        if self.is_binary_file(file_path) if is_binary is None else is_binary:
             # For binary files, allow up to 1% size difference or 500 bytes, whichever is larger
             # This accounts for base64 encoding overhead and metadata differences
-            tolerance = max(500, int(original_size * 0.01))
-            return tolerance
+            return max(500, original_size // 100)
         else:
             # Text files should match exactly
             return 0
 
-    def should_compare_content(self, file_path: str, file_size: int) -> bool:
+    def should_compare_content(self, file_path: str, file_size: int, is_binary: Optional[bool] = None) -> bool:
         """Determine if content comparison should be performed."""
         # Skip content comparison for very large files
         if file_size > 50 * 1024 * 1024:  # 50MB
             return False
         
         # For binary files over 1MB, skip content comparison if size is within tolerance
-        if self.is_binary_file(file_path) and file_size > 1024 * 1024:
+        if file_size > 1024 * 1024 and (self.is_binary_file(file_path) if is_binary is None else is_binary):
             return False
         
         return True
 
-    def scan_directory(self, path: Path, is_original: bool = True) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    def scan_directory(self, path: Path, is_original: bool = True,
+                       on_file: Optional[Callable[[str, Dict], None]] = None) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
         """
         Scan a directory and return dictionaries of files and directories.
         Returns relative paths as keys to handle different root paths.
@@ -324,6 +424,7 @@ class DirectoryValidator:
         Args:
             path: Path to scan
             is_original: True if this is the original directory (to apply .gitignore), False for extracted
+            on_file: Called with the relative path and info of each file as soon as it is found
         """
         files = {}
         dirs = {}
@@ -332,111 +433,266 @@ class DirectoryValidator:
             self.log_error(f"Path does not exist: {path}")
             return files, dirs
 
-        def walk_directory(current_path: Path, base_path: Path):
-            """Recursively walk directory, respecting ignore patterns."""
+        # Relative paths are sliced off this prefix; separators are normalized below
+        base = os.path.join(str(path), '')
+        
+        # Directory listings are read and stat'ed on a pool while entries are processed here
+        # in depth-first order, so ignore decisions and messages come out as before
+        pending: Dict[str, Future] = {}
+        # Ignore decisions for subdirectories, made before their listings are prefetched
+        dir_ignores: Dict[str, str] = {}
+        
+        def open_directory(pool: ThreadPoolExecutor, dir_path: str, stack: List[Tuple]):
+            """Start processing a directory listing, skipping directories we can't access."""
+            future = pending.pop(dir_path, None) or pool.submit(self._list_directory, dir_path)
             try:
-                for item in current_path.iterdir():
-                    # Apply ignore patterns only for the original directory
-                    if is_original and self.should_ignore(item):
-                        if item.is_file():
-                            self.stats['files_ignored_by_gitignore'] += 1
-                        elif item.is_dir():
-                            self.stats['dirs_ignored_by_gitignore'] += 1
-                        continue  # Skip this item and all its children
+                listed, error = future.result()
+            except PermissionError:
+                # Skip directories we can't access
+                return
+            except Exception as e:
+                self.log_error(f"Error scanning directory {dir_path}: {e}")
+                return
+            
+            # Prefetch the listings of subdirectories that will be entered while this one is
+            # processed; ignore checks are string-only, so ignored ones are never listed
+            for item, is_dir, _, _ in listed:
+                if is_dir:
+                    if is_original:
+                        rel_path_str = item.path[len(base):].replace('\\', '/')
+                        reason = self._ignore_reason(Path(item.path), True, rel_path_str)
+                        if reason is not None:
+                            dir_ignores[item.path] = reason
+                            continue
+                    pending[item.path] = pool.submit(self._list_directory, item.path)
+            stack.append((dir_path, iter(listed), error))
+        
+        def walk_directory(pool: ThreadPoolExecutor, root: str):
+            """Walk the directory tree depth-first, respecting ignore patterns."""
+            stack = []
+            open_directory(pool, root, stack)
+            while stack:
+                current_path, entries, error = stack[-1]
+                try:
+                    listed = next(entries, None)
+                    if listed is None:
+                        stack.pop()
+                        if error is not None and not isinstance(error, PermissionError):
+                            self.log_error(f"Error scanning directory {current_path}: {error}")
+                        continue
+                    
+                    item, is_dir, is_file, stat = listed
                     
                     # Get relative path from the root
-                    rel_path = item.relative_to(base_path)
-                    rel_path_str = str(rel_path).replace('\\', '/')  # Normalize path separators
+                    rel_path_str = item.path[len(base):].replace('\\', '/')  # Normalize path separators
+                    
+                    # Apply ignore patterns only for the original directory. Ignored directories
+                    # are never entered, so every entry checked here has no ignored parent
+                    if is_original:
+                        if is_dir:
+                            reason = dir_ignores.pop(item.path, None)
+                        else:
+                            reason = self._ignore_reason(Path(item.path), is_dir, rel_path_str)
+                        if reason is not None:
+                            if reason:
+                                self.log_verbose(f"Ignoring ({reason}): {item.path}")
+                            if is_file:
+                                self.stats['files_ignored_by_gitignore'] += 1
+                            elif is_dir:
+                                self.stats['dirs_ignored_by_gitignore'] += 1
+                            continue  # Skip this item and all its children
+                    
+                    # Directory symlinks are not followed; the packager counts them as ignored
+                    if not is_dir and not is_file and item.is_symlink() and item.is_dir():
+                        if is_original:
+                            self.log_verbose(f"Ignoring (directory symlink): {item.path}")
+                            self.stats['dirs_ignored_by_gitignore'] += 1
+                        continue
+                    
+                    if isinstance(stat, Exception):
+                        raise stat
                     
-                    if item.is_file():
+                    if is_file:
                         files[rel_path_str] = {
-                            'path': item,
-                            'size': item.stat().st_size,
-                            'modified': item.stat().st_mtime
+                            'path': item.path,
+                            'size': stat.st_size,
+                            'modified': stat.st_mtime,
+                            # Decided once here instead of on every size/content check
+                            'binary': self.is_binary_file(item.name)
                         }
-                    elif item.is_dir():
+                        if on_file is not None:
+                            on_file(rel_path_str, files[rel_path_str])
+                    elif is_dir:
                         dirs[rel_path_str] = {
-                            'path': item,
-                            'modified': item.stat().st_mtime
+                            'path': item.path,
+                            'modified': stat.st_mtime
                         }
-                        # Recursively walk subdirectory only if not ignored
-                        walk_directory(item, base_path)
+                        # Walk subdirectory only if not ignored
+                        open_directory(pool, item.path, stack)
                         
-            except PermissionError:
-                # Skip directories we can't access
-                pass
-            except Exception as e:
-                self.log_error(f"Error scanning directory {current_path}: {e}")
+                except PermissionError:
+                    # Skip directories we can't access
+                    stack.pop()
+                except Exception as e:
+                    self.log_error(f"Error scanning directory {current_path}: {e}")
+                    stack.pop()
         
         try:
-            walk_directory(path, path)
+            with ThreadPoolExecutor(max_workers=self.SCAN_WORKERS) as pool:
+                try:
+                    walk_directory(pool, str(path))
+                finally:
+                    # Listings of directories that were never entered are not needed
+                    for future in pending.values():
+                        future.cancel()
         except Exception as e:
             self.log_error(f"Error scanning directory {path}: {e}")
         
+        self.flush_log()
         return files, dirs
 
-    def compare_files(self, original_files: Dict[str, Dict], extracted_files: Dict[str, Dict]) -> bool:
-        """Compare files between original and extracted directories."""
+    def _list_directory(self, dir_path: str) -> Tuple[List[Tuple], Optional[Exception]]:
+        """
+        List a directory and stat its entries (runs on the scan pool).
+        
+        Returns (entries, error): each entry is (DirEntry, is_dir, is_file, stat) where stat
+        is None for other entry types or the exception raised while stat'ing it; error is
+        set if the listing stopped early.
+        """
+        listed = []
+        with os.scandir(dir_path) as entries:
+            try:
+                for item in entries:
+                    # Directory symlinks are not followed, matching the packager
+                    is_dir = item.is_dir(follow_symlinks=False)
+                    is_file = not is_dir and item.is_file()
+                    stat = None
+                    if is_dir or is_file:
+                        try:
+                            stat = item.stat()
+                        except OSError as e:
+                            stat = e
+                    listed.append((item, is_dir, is_file, stat))
+            except Exception as e:
+                return listed, e
+        return listed, None
+
+    def compare_files(self, original_files: Dict[str, Dict], extracted_files: Dict[str, Dict],
+                      compare_futures: Optional[Dict[str, Future]] = None) -> bool:
+        """Compare files between original and extracted directories (optionally using comparisons already started)."""
         print("\n>> Comparing files...")
         
         self.stats['total_files_original'] = len(original_files)
         self.stats['total_files_extracted'] = len(extracted_files)
         
-        all_files = set(original_files.keys()) | set(extracted_files.keys())
+        all_files = original_files.keys() | extracted_files.keys()
         files_match = True
         
-        for file_path in sorted(all_files):
-            if file_path in original_files and file_path in extracted_files:
-                # File exists in both
-                orig_info = original_files[file_path]
-                extr_info = extracted_files[file_path]
-                
-                # Compare file sizes
-                size_diff = abs(orig_info['size'] - extr_info['size'])
-                size_tolerance = self.get_size_tolerance(file_path, orig_info['size'])
-                
-                if size_diff > size_tolerance:
-                    self.log_error(f"Size mismatch for {file_path}: original={orig_info['size']}, extracted={extr_info['size']}, diff={size_diff}")
-                    self.stats['files_size_mismatch'] += 1
-                    files_match = False
+        # Compare the contents of every same-sized pair up front on a thread pool;
+        # file reads release the GIL, so pairs are processed in parallel
+        executor = None
+        if compare_futures is None:
+            compare_futures = {}
+            if len(all_files) > self.PARALLEL_COMPARE_MIN_FILES:
+                executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+                for file_path in original_files.keys() & extracted_files.keys():
+                    self.submit_comparison(executor, file_path, original_files[file_path],
+                                           extracted_files[file_path], compare_futures)
+        
+        try:
+            for file_path in sorted(all_files):
+                files_match = self._compare_file(file_path, original_files, extracted_files,
+                                                 compare_futures.get(file_path)) and files_match
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        
+        self.flush_log()
+        return files_match
+
+    def submit_comparison(self, executor: ThreadPoolExecutor, file_path: str, orig_info: Dict,
+                          extr_info: Dict, compare_futures: Dict[str, Future]):
+        """Start comparing a file pair on the pool if its contents will need checking."""
+        if (orig_info['size'] == extr_info['size'] and
+                not self.metadata_matches(orig_info, extr_info) and
+                self.should_compare_content(file_path, orig_info['size'], orig_info['binary'])):
+            compare_futures[file_path] = executor.submit(
+                self._compare_file_contents, orig_info['path'], extr_info['path'], 0)
+
+    def metadata_matches(self, orig_info: Dict, extr_info: Dict) -> bool:
+        """In quick mode, check whether size and whole-second mtime are identical."""
+        return (self.quick and orig_info['size'] == extr_info['size'] and
+                int(orig_info['modified']) == int(extr_info['modified']))
+
+    def _comparison_result(self, future: Future, original_path: str, extracted_path: str) -> Optional[bool]:
+        """Collect a comparison made on the pool, logging failures like compare_file_contents does."""
+        try:
+            return future.result()
+        except Exception as e:
+            self.log_warning(f"Could not compare contents of {original_path} and {extracted_path}: {e}")
+            return None
+
+    def _compare_file(self, file_path: str, original_files: Dict[str, Dict],
+                      extracted_files: Dict[str, Dict],
+                      compare_future: Optional[Future] = None) -> bool:
+        """Compare one file between original and extracted directories."""
+        files_match = True
+        if file_path in original_files and file_path in extracted_files:
+            # File exists in both
+            orig_info = original_files[file_path]
+            extr_info = extracted_files[file_path]
+            
+            # Compare file sizes
+            size_diff = abs(orig_info['size'] - extr_info['size'])
+            size_tolerance = self.get_size_tolerance(file_path, orig_info['size'], orig_info['binary'])
+            
+            if size_diff > size_tolerance:
+                self.log_error(f"Size mismatch for {file_path}: original={orig_info['size']}, extracted={extr_info['size']}, diff={size_diff}")
+                self.stats['files_size_mismatch'] += 1
+                files_match = False
+            else:
+                if size_diff > 0:
+                    self.log_verbose(f"✅ Size match (within tolerance): {file_path} (diff: {size_diff} bytes)")
                 else:
-                    if size_diff > 0:
-                        self.log_verbose(f"✅ Size match (within tolerance): {file_path} (diff: {size_diff} bytes)")
-                    else:
-                        self.log_verbose(f"✅ Size match: {file_path} ({orig_info['size']} bytes)")
+                    self.log_verbose(f"✅ Size match: {file_path} ({orig_info['size']} bytes)")
+            
+            # Compare file content for text files and small binary files
+            if self.metadata_matches(orig_info, extr_info):
+                self.log_verbose(f"✅ Content assumed to match (same size and mtime): {file_path}")
+                self.stats['files_matched'] += 1
+            elif self.should_compare_content(file_path, orig_info['size'], orig_info['binary']):
+                if compare_future is not None:
+                    contents_equal = self._comparison_result(compare_future, orig_info['path'], extr_info['path'])
+                else:
+                    contents_equal = self.compare_file_contents(orig_info['path'], extr_info['path'], size_diff)
                 
-                # Compare file content (hash) for text files and small binary files
-                if self.should_compare_content(file_path, orig_info['size']):
-                    orig_hash = self.get_file_hash(orig_info['path'])
-                    extr_hash = self.get_file_hash(extr_info['path'])
-                    
-                    if orig_hash and extr_hash and orig_hash != extr_hash:
-                        # For binary files, size match within tolerance is acceptable
-                        if self.is_binary_file(file_path) and size_diff <= size_tolerance:
-                            self.log_verbose(f"✅ Binary file content acceptable: {file_path} (size within tolerance)")
-                            self.stats['files_matched'] += 1
-                        else:
-                            self.log_error(f"Content mismatch for {file_path}")
-                            self.stats['files_content_mismatch'] += 1
-                            files_match = False
-                    elif orig_hash and extr_hash:
-                        self.log_verbose(f"✅ Content match: {file_path}")
+                if contents_equal is False:
+                    # For binary files, size match within tolerance is acceptable
+                    if orig_info['binary'] and size_diff <= size_tolerance:
+                        self.log_verbose(f"✅ Binary file content acceptable: {file_path} (size within tolerance)")
                         self.stats['files_matched'] += 1
-                else:
-                    self.log_warning(f"Skipping content comparison for large file: {file_path} ({orig_info['size']} bytes)")
+                    else:
+                        self.log_error(f"Content mismatch for {file_path}")
+                        self.stats['files_content_mismatch'] += 1
+                        files_match = False
+                elif contents_equal:
+                    self.log_verbose(f"✅ Content match: {file_path}")
                     self.stats['files_matched'] += 1
-                
-            elif file_path in original_files:
-                # File missing in extracted
-                self.log_error(f"File missing in extracted: {file_path}")
-                self.stats['files_missing'] += 1
-                files_match = False
-                
             else:
-                # Extra file in extracted
-                self.log_warning(f"Extra file in extracted: {file_path}")
-                self.stats['files_extra'] += 1
-        
+                self.log_warning(f"Skipping content comparison for large file: {file_path} ({orig_info['size']} bytes)")
+                self.stats['files_matched'] += 1
+            
+        elif file_path in original_files:
+            # File missing in extracted
+            self.log_error(f"File missing in extracted: {file_path}")
+            self.stats['files_missing'] += 1
+            files_match = False
+            
+        else:
+            # Extra file in extracted
+            self.log_warning(f"Extra file in extracted: {file_path}")
+            self.stats['files_extra'] += 1
+    
         return files_match
 
     def compare_directories(self, original_dirs: Dict[str, Dict], extracted_dirs: Dict[str, Dict]) -> bool:
@@ -446,7 +702,7 @@ class DirectoryValidator:
         self.stats['total_dirs_original'] = len(original_dirs)
         self.stats['total_dirs_extracted'] = len(extracted_dirs)
         
-        all_dirs = set(original_dirs.keys()) | set(extracted_dirs.keys())
+        all_dirs = original_dirs.keys() | extracted_dirs.keys()
         dirs_match = True
         
         for dir_path in sorted(all_dirs):
@@ -461,6 +717,7 @@ class DirectoryValidator:
                 self.log_warning(f"Extra directory in extracted: {dir_path}")
                 self.stats['dirs_extra'] += 1
         
+        self.flush_log()
         return dirs_match
 
     def validate(self) -> bool:
@@ -483,16 +740,41 @@ class DirectoryValidator:
         # Load .gitignore patterns from original directory
         self.load_gitignore(self.original_path)
         
-        # Scan both directories
-        print("\n>> Scanning original directory...")
-        original_files, original_dirs = self.scan_directory(self.original_path, is_original=True)
-        
-        print(">> Scanning extracted directory...")
-        extracted_files, extracted_dirs = self.scan_directory(self.extracted_path, is_original=False)
-        
-        # Compare directories and files
-        dirs_match = self.compare_directories(original_dirs, extracted_dirs)
-        files_match = self.compare_files(original_files, extracted_files)
+        # Scan both directories; the extracted one needs no ignore checks (and prints
+        # nothing), so it is scanned in the background alongside the original.
+        # Each original file's content comparison starts as soon as the scan finds it,
+        # so file contents are read while the rest of the tree is still being scanned.
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as compare_pool:
+            extracted_scan = executor.submit(self.scan_directory, self.extracted_path, False)
+            compare_futures = {}
+            # Files found before the extracted scan finishes wait here instead of blocking the walk
+            queued: List[Tuple[str, Dict]] = []
+            
+            def submit_queued():
+                extracted = extracted_scan.result()[0]
+                for file_path, orig_info in queued:
+                    extr_info = extracted.get(file_path)
+                    if extr_info is not None:
+                        self.submit_comparison(compare_pool, file_path, orig_info, extr_info, compare_futures)
+                queued.clear()
+            
+            def start_comparison(file_path: str, orig_info: Dict):
+                queued.append((file_path, orig_info))
+                if extracted_scan.done():
+                    submit_queued()
+            
+            print("\n>> Scanning original directory...")
+            original_files, original_dirs = self.scan_directory(self.original_path, is_original=True,
+                                                                on_file=start_comparison)
+            
+            print(">> Scanning extracted directory...")
+            extracted_files, extracted_dirs = extracted_scan.result()
+            submit_queued()
+            
+            # Compare directories and files
+            dirs_match = self.compare_directories(original_dirs, extracted_dirs)
+            files_match = self.compare_files(original_files, extracted_files, compare_futures)
         
         # Print summary
         self.print_summary()
@@ -548,6 +830,38 @@ class DirectoryValidator:
             for i, warning in enumerate(self.warnings, 1):
                 print(f"  {i}. {warning}")
 
+def encode_report_json(data, indent: bool = False) -> bytes:
+    """
+    Encode report data as JSON, with orjson when it is installed.
+    
+    orjson rejects strings that are not valid UTF-8, such as file names that
+    os.fsdecode turned into lone surrogates; those fall back to the stdlib encoder,
+    which writes them as \\u escapes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2 if indent else None).encode('ascii')
+
+
+def save_ndjson_report(report: Dict, report_path: str):
+    """
+    Write a validation report as newline-delimited JSON.
+    
+    The first line holds everything except the error and warning lists; each error and
+    warning then gets its own line, so huge reports are written (and can be read back)
+    one record at a time.
+    """
+    summary = {key: value for key, value in report.items() if key not in ('errors', 'warnings')}
+    with open(report_path, 'wb') as f:
+        f.write(encode_report_json({'type': 'summary', **summary}) + b'\n')
+        for level in ('error', 'warning'):
+            for message in report[level + 's']:
+                f.write(encode_report_json({'type': level, 'message': message}) + b'\n')
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate that extracted directory matches original directory"
@@ -569,15 +883,24 @@ def main():
         "--save-report",
         help="Save detailed report to JSON file"
     )
+    parser.add_argument(
+        "--save-report-ndjson",
+        help="Save the report as newline-delimited JSON: a summary line, then one line per error and warning"
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Treat files with the same size and modification time as matching without reading them"
+    )
     
     args = parser.parse_args()
     
     # Create validator and run validation
-    validator = DirectoryValidator(args.original, args.extracted, args.verbose)
+    validator = DirectoryValidator(args.original, args.extracted, args.verbose, args.quick)
     success = validator.validate()
     
     # Save report if requested
-    if args.save_report:
+    if args.save_report or args.save_report_ndjson:
         report = {
             'timestamp': datetime.now().isoformat(),
             'original_path': str(validator.original_path),
@@ -587,11 +910,18 @@ def main():
             'errors': validator.errors,
             'warnings': validator.warnings
         }
-        
-        with open(args.save_report, 'w') as f:
-            json.dump(report, f, indent=2)
+    
+    if args.save_report:
+        # Encoded before the file is opened, so a failure never leaves it empty
+        data = encode_report_json(report, indent=True)
+        with open(args.save_report, 'wb') as f:
+            f.write(data)
         print(f"\n📄 Report saved to: {args.save_report}")
     
+    if args.save_report_ndjson:
+        save_ndjson_report(report, args.save_report_ndjson)
+        print(f"\n📄 Report saved to: {args.save_report_ndjson}")
+    
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 